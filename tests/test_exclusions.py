@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("watchdog")
+pytest.importorskip("pygame")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from watchdog.events import DirModifiedEvent, FileCreatedEvent, FileModifiedEvent  # noqa: E402
+
+import vibe_monitor  # noqa: E402
+
+ROOT = os.path.join(os.sep, "proj")
+
+
+def path(*parts):
+    return os.path.join(ROOT, *parts)
+
+
+def make_handler(**kwargs):
+    return vibe_monitor.FileChangeHandler("jobs-done", delay=60, watch_path=ROOT, **kwargs)
+
+
+def accepted_via_dispatch(handler, file_path):
+    """Feed a watchdog event through dispatch, as the watchdog backend does."""
+    handler._last_accept_ns = time.monotonic_ns() - vibe_monitor.DEBOUNCE_NS
+    handler._change_evt.clear()
+    handler.dispatch(FileModifiedEvent(file_path))
+    return handler._change_evt.is_set()
+
+
+def accepted_via_process(handler, file_path):
+    """Feed a raw path to _process, as the watchfiles backend does."""
+    handler._last_accept_ns = time.monotonic_ns() - vibe_monitor.DEBOUNCE_NS
+    handler._change_evt.clear()
+    handler._process(file_path)
+    return handler._change_evt.is_set()
+
+
+CASES = [
+    # (excluded_files, excluded_folders, path, accepted)
+    (["*.tmp"], [], path("src", "a.py"), True),
+    (["*.tmp"], [], path("src", "a.tmp"), False),
+    (["debug*"], [], path("debug.log"), False),
+    (["debug*"], [], path("debugger", "main.c"), True),
+    (["test_*.py"], [], path("test_data", "foo.py"), True),
+    (["test_*.py"], [], path("tests", "test_foo.py"), False),
+    ([], ["logs"], path("logs", "a.txt"), False),
+    ([], ["logs"], path("app", "logs", "a.txt"), False),
+    ([], ["logs"], path("mylogs", "a.txt"), True),
+    ([], ["Node_Modules"], path("node_modules", "x", "y.js"), False),
+    ([], [path("vendor")], path("vendor", "lib.c"), False),
+    ([], [path("vendor")], path("app", "vendor", "lib.c"), True),
+    ([], [os.path.join(os.sep, "elsewhere", "vendor")], path("vendor", "lib.c"), True),
+]
+
+
+@pytest.mark.parametrize("excluded_files, excluded_folders, file_path, accepted", CASES)
+def test_backends_agree_on_exclusions(excluded_files, excluded_folders, file_path, accepted):
+    # Empty lists would fall back to the configured defaults, so use a placeholder that never matches
+    handler = make_handler(excluded_files=excluded_files or ["none"], excluded_folders=excluded_folders or ["none"])
+    assert accepted_via_dispatch(handler, file_path) is accepted
+    assert accepted_via_process(handler, file_path) is accepted
+
+
+def test_dispatch_ignores_directories_and_other_event_types():
+    handler = make_handler()
+    handler._change_evt.clear()
+    handler.dispatch(DirModifiedEvent(path("src")))
+    handler.dispatch(FileCreatedEvent(path("src", "a.py")))
+    assert not handler._change_evt.is_set()
+    assert accepted_via_dispatch(handler, path("src", "a.py"))
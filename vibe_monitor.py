@@ -5,17 +5,48 @@ A file system monitor that plays notification sounds when file activity stops.
 Perfect for knowing when your builds, tests, or long-running tasks are complete.
 """
 
+import io
 import os
+import re
 import time
 import sys
 import json
+import threading
+import fnmatch
 import argparse
+import logging
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.observers.polling import PollingObserver
+from watchdog.events import EVENT_TYPE_MODIFIED, FileSystemEventHandler
 import pygame.mixer
 
-# Initialize pygame mixer
-pygame.mixer.init()
+# Faster JSON parser for the config file when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Optional Rust-backed watcher, used with --backend watchfiles
+try:
+    import watchfiles
+except ImportError:
+    watchfiles = None
+
+logger = logging.getLogger(__name__)
+
+# Longest single wait in the main loop; Windows can't interrupt an untimed wait with Ctrl+C
+MAX_WAIT = 1 if os.name == "nt" else None
+
+# Events arriving this soon after the last accepted change are coalesced into it
+DEBOUNCE_NS = 50_000_000  # 50 ms
+
+# Above this many top-level directories, fall back to one recursive watch, since
+# watchdog runs a thread (and on Linux an inotify instance) for every watch
+MAX_SPLIT_WATCHES = 32
+
+# Seconds between directory scans when polling instead of using native OS events
+DEFAULT_POLL_INTERVAL = 30
 
 # Get the directory where the script is located
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -61,8 +92,8 @@ def load_config():
     """Load configuration from JSON file or use defaults if file not found."""
     try:
         if os.path.exists(CONFIG_FILE):
-            with open(CONFIG_FILE, 'r') as f:
-                config = json.load(f)
+            with open(CONFIG_FILE, 'rb') as f:
+                config = _json_loads(f.read())
                 print(f"Configuration loaded from {CONFIG_FILE}")
                 return config
         else:
@@ -91,74 +122,311 @@ for sound_name, sound_path in CONFIG.get("sound_files", {}).items():
     # If path is relative, make it absolute based on script directory
     if not os.path.isabs(sound_path):
         sound_path = os.path.join(SCRIPT_DIR, sound_path)
+    # Check each file once here rather than on every alert
+    if not os.path.exists(sound_path):
+        print(f"Warning: Sound file for '{sound_name}' not found at {sound_path}")
+        continue
     SOUND_FILES[sound_name] = sound_path
 
+def _is_extension_pattern(pattern):
+    """True for patterns like "*.tmp" that only constrain the file suffix."""
+    suffix = pattern[1:]
+    return pattern.startswith("*") and "." in suffix and not any(c in suffix for c in "*?[")
+
 class FileChangeHandler(FileSystemEventHandler):
-    def __init__(self, sound_key, excluded_files=None, excluded_folders=None, delay=DEFAULT_DELAY):
-        self.last_change = time.time()
+    def __init__(self, sound_key, excluded_files=None, excluded_folders=None, delay=DEFAULT_DELAY, watch_path=None):
+        self.last_change = time.monotonic()
         self.has_alerted = False  # Flag to ensure single alert
         self.sound_key = sound_key  # Store the sound key
         self.excluded_files = excluded_files or DEFAULT_EXCLUDED_FILES
         self.excluded_folders = excluded_folders or DEFAULT_EXCLUDED_FOLDERS
         self.delay = delay
+        self._change_evt = threading.Event()  # Set whenever an accepted change arrives
+        self.watcher_error = None  # Set if a background watcher thread dies
+        self._last_accept_ns = time.monotonic_ns() - DEBOUNCE_NS
+
+        # Folder exclusions are matched against paths relative to the watched root
+        self._root_exact = os.path.join(os.path.normpath(os.path.abspath(watch_path)), "") if watch_path else None
+        self._root = self._root_exact.lower() if watch_path else None
+
+        # Precompute normalized folder exclusions once instead of on every event
+        # Absolute folders only match at that exact location; plain names match at any depth
+        anchored_folders = []
+        normalized_folders = []
+        for folder in self.excluded_folders:
+            folder_normalized = os.path.normpath(folder).lower()
+            if os.path.isabs(folder_normalized):
+                if self._root:
+                    if not folder_normalized.startswith(self._root):
+                        continue  # Outside the watched tree, can never match
+                    folder_normalized = folder_normalized[len(self._root):]
+                anchored_folders.append(folder_normalized)
+            else:
+                normalized_folders.append(folder_normalized)
+        self._excluded_prefixes = tuple(folder + os.sep for folder in anchored_folders + normalized_folders)
+        # Whole path components only, so "logs" skips ".../logs/" but not ".../mylogs/"
+        sep = re.escape(os.sep)
+        self._excluded_component_re = re.compile(
+            "(?:^|%s)(?:%s)%s" % (sep, "|".join(re.escape(folder) for folder in normalized_folders), sep)
+        ) if normalized_folders else None
+
+        # Plain "*.ext" patterns are checked with one endswith call; the rest are compiled into a regex
+        self._excluded_exts = tuple(
+            pattern[1:] for pattern in self.excluded_files if _is_extension_pattern(pattern)
+        )
+        other_patterns = [pattern for pattern in self.excluded_files if not _is_extension_pattern(pattern)]
+        self._excluded_file_re = re.compile(
+            "|".join(fnmatch.translate(pattern) for pattern in other_patterns)
+        ) if other_patterns else None
+
+    def dispatch(self, event):
+        # Filter before any on_* callback runs, using the same rules as the watchfiles backend
+        if event.is_directory or event.event_type != EVENT_TYPE_MODIFIED:
+            return
+        self._process(event.src_path)
+
+    def _process(self, file_path):
+        """Record a change to file_path unless it is debounced or excluded."""
+        # Coalesce save storms: a change was just recorded, so this one adds nothing
+        now = time.monotonic_ns()
+        if now - self._last_accept_ns < DEBOUNCE_NS:
+            return
+        if not self.is_excluded(file_path):
+            self._record_change(file_path, now)
+
+    def is_excluded(self, file_path):
+        """True if file_path matches a file exclusion or lies in an excluded folder."""
+        file_dir, file_name = os.path.split(file_path)
+        if self.is_excluded_dir(file_dir):
+            return True
+
+        # File patterns only ever apply to the file name, never to its directories
+        if file_name.endswith(self._excluded_exts):
+            return True
+        return bool(self._excluded_file_re and self._excluded_file_re.match(file_name))
+
+    def is_excluded_dir(self, dir_path):
+        """True if dir_path is, or is inside, one of the excluded folders."""
+        # Watcher paths are already clean on POSIX, so only normalize when they may not be
+        if os.name != "posix" or "//" in dir_path or "/." in dir_path:
+            dir_path = os.path.normpath(dir_path)
+
+        # Compare case-insensitively, relative to the watched root. Watchers report
+        # paths under the root exactly as it was given, so strip it before lowercasing
+        dir_normalized = dir_path + os.sep
+        if self._root_exact and dir_normalized.startswith(self._root_exact):
+            dir_normalized = dir_normalized[len(self._root_exact):].lower()
+        else:
+            dir_normalized = dir_normalized.lower()
+            if self._root and dir_normalized.startswith(self._root):
+                dir_normalized = dir_normalized[len(self._root):]
+        if dir_normalized.startswith(self._excluded_prefixes):
+            return True
+        return bool(self._excluded_component_re and self._excluded_component_re.search(dir_normalized))
 
-    def on_modified(self, event):
-        if not event.is_directory:
-            file_path = event.src_path
-            file_name = os.path.basename(file_path)
-            file_dir = os.path.dirname(file_path)
-
-            # Normalize paths for consistent comparison
-            file_dir_normalized = os.path.normpath(file_dir).lower()
-            for excluded_folder in self.excluded_folders:
-                excluded_folder_normalized = os.path.normpath(excluded_folder).lower()
-                if file_dir_normalized.startswith(excluded_folder_normalized) or excluded_folder_normalized in file_dir_normalized:
-                    return
-
-            # Check if file should be excluded
-            for excluded_pattern in self.excluded_files:
-                # Simple wildcard handling
-                if excluded_pattern.startswith("*") and file_name.endswith(excluded_pattern[1:]):
-                    return
-                elif excluded_pattern == file_name:
-                    return
-
-            print(f"Change detected: {file_path}")
-            self.last_change = time.time()
-            self.has_alerted = False
+    def _record_change(self, file_path, now):
+        """Restart the inactivity timer for an accepted change."""
+        self._last_accept_ns = now
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Change detected: %s", file_path)
+        self.last_change = time.monotonic()
+        self.has_alerted = False
+        self._change_evt.set()
+
+    def watcher_failed(self, error):
+        """Record that the background watcher died and wake the main loop so it can exit."""
+        self.watcher_error = error
+        self._change_evt.set()
+
+    def wait_for_change(self):
+        """Block until a change arrives or the delay expires. Returns True on change."""
+        if self.has_alerted:
+            timeout = None  # Nothing to do until the next change
+        else:
+            timeout = max(self.delay - (time.monotonic() - self.last_change), 0)
+        if MAX_WAIT is not None:
+            timeout = MAX_WAIT if timeout is None else min(timeout, MAX_WAIT)
+        changed = self._change_evt.wait(timeout=timeout)
+        self._change_evt.clear()
+        return changed
 
     def check_completion(self):
-        current_time = time.time()
+        if self.has_alerted:
+            return  # Already alerted; nothing to do until the next change resets the flag
+        current_time = time.monotonic()
         time_since_last_change = current_time - self.last_change
-        print(f"Time since last change: {time_since_last_change:.2f} seconds")
-        if not self.has_alerted and time_since_last_change >= self.delay:
+        logger.debug("Time since last change: %.2f seconds", time_since_last_change)
+        if time_since_last_change >= self.delay:
             print("Activity stopped! Your task is likely complete.")
             play_system_sound(self.sound_key)  # Pass the sound key here
             self.has_alerted = True
 
+# Decoded sounds keyed by file path, so each file is only decoded once
+_SOUND_CACHE = {}
+
+# Raw sound file contents keyed by file path, so decoding needs no disk access
+_SOUND_BYTES = {}
+
+def get_sound_file(sound_key):
+    """Resolve a sound key to its file path, falling back to the default sound."""
+    return SOUND_FILES.get(sound_key, SOUND_FILES.get(CONFIG.get("settings", {}).get("default_sound", "jobs-done")))
+
+def _ensure_mixer():
+    """Open the audio device on first use, so monitoring alone never touches the audio stack."""
+    if not pygame.mixer.get_init():
+        # Large buffer so playback doesn't underrun while a busy build loads the CPU
+        pygame.mixer.init(frequency=44100, size=-16, channels=2, buffer=4096)
+
+def read_sound_bytes(sound_key):
+    """Read the sound file for sound_key into memory if it isn't already."""
+    sound_file = get_sound_file(sound_key)
+    if sound_file is not None and sound_file not in _SOUND_BYTES:
+        with open(sound_file, 'rb') as f:
+            _SOUND_BYTES[sound_file] = f.read()
+
+def load_sound(sound_key):
+    """Return the decoded Sound for sound_key, decoding the file on first use."""
+    sound_file = get_sound_file(sound_key)
+    if sound_file is None:
+        print(f"Error: No sound file available for '{sound_key}'")
+        return None
+    sound = _SOUND_CACHE.get(sound_file)
+    if sound is None:
+        _ensure_mixer()
+        data = _SOUND_BYTES.get(sound_file)
+        sound = pygame.mixer.Sound(file=io.BytesIO(data)) if data is not None else pygame.mixer.Sound(sound_file)
+        sound.set_volume(DEFAULT_VOLUME)  # Set volume from config
+        _SOUND_CACHE[sound_file] = sound
+        _SOUND_BYTES.pop(sound_file, None)  # The decoded Sound is all that's needed from now on
+    return sound
+
 def play_system_sound(sound_key):
-    """Play the specified sound file at configured volume."""
-    sound_file = SOUND_FILES.get(sound_key, SOUND_FILES.get(CONFIG.get("settings", {}).get("default_sound", "jobs-done")))
-    print(f"Attempting to play sound file: {sound_file}")
-    if not os.path.exists(sound_file):
-        print(f"Error: Sound file not found at {sound_file}")
-        return
+    """Play the specified sound file at configured volume.
+
+    Playback is asynchronous: the mixer plays the sound on its own thread and
+    this returns immediately so the monitor keeps handling events.
+    """
+    print(f"Attempting to play sound file: {get_sound_file(sound_key)}")
     try:
+        sound = load_sound(sound_key)
+        if sound is None:
+            return
         print("Playing sound notification...")
-        sound = pygame.mixer.Sound(sound_file)
-        sound.set_volume(DEFAULT_VOLUME)  # Set volume from config
         sound.play()
-        # Wait for the sound to finish playing
-        while pygame.mixer.get_busy():
-            time.sleep(0.1)
-        print("Sound playback completed.")
     except Exception as e:
         print(f"Error playing sound: {e}")
 
-def main(watch_path, sound_key, delay=None, exclude_file=None, exclude_dir=None):
+def _run_watchfiles(watch_path, handler, stop_event):
+    """Feed coalesced batches from watchfiles into the handler until stop_event is set."""
+    try:
+        for changes in watchfiles.watch(watch_path, step=50, debounce=1600, recursive=True,
+                                        watch_filter=None, stop_event=stop_event):
+            for change, path in changes:
+                # Match the watchdog backend, which ignores deletions and new directories
+                if change == watchfiles.Change.deleted:
+                    continue
+                if change == watchfiles.Change.added and os.path.isdir(path):
+                    continue
+                handler._process(path)
+    except Exception as e:
+        # Without this the main loop would keep waiting and report "done" for an unwatched tree
+        handler.watcher_failed(e)
+
+class WatchScheduler(FileSystemEventHandler):
+    """Watch the root on its own and each non-excluded top-level directory recursively.
+
+    Excluded trees such as node_modules or .git then never get kernel watches, so
+    their events are never generated rather than filtered out afterwards.
+    """
+
+    def __init__(self, observer, file_handler, watch_path):
+        self.observer = observer
+        self.file_handler = file_handler
+        self.watch_path = watch_path
+
+    def schedule(self):
+        subdirs = [
+            entry.path for entry in os.scandir(self.watch_path)
+            if entry.is_dir(follow_symlinks=False) and not self.file_handler.is_excluded_dir(entry.path)
+        ]
+        if len(subdirs) > MAX_SPLIT_WATCHES:
+            self.observer.schedule(self.file_handler, self.watch_path, recursive=True)
+            return
+        root_watch = self.observer.schedule(self.file_handler, self.watch_path, recursive=False)
+        # Only the root watch reports new top-level directories that need their own watch
+        self.observer.add_handler_for_watch(self, root_watch)
+        for path in subdirs:
+            self._watch_subtree(path)
+
+    def _watch_subtree(self, path):
+        if self.file_handler.is_excluded_dir(path):
+            return
+        if self._subtree_watch_count() >= MAX_SPLIT_WATCHES:
+            self._collapse()
+            return
+        try:
+            self.observer.schedule(self.file_handler, path, recursive=True)
+        except OSError as e:
+            print(f"Error watching {path}: {e}")  # Most likely removed again already
+
+    def _subtree_watch_count(self):
+        return sum(1 for emitter in self.observer.emitters if emitter.watch.is_recursive)
+
+    def _collapse(self):
+        """Replace the split watches with one recursive watch on the root once the cap is hit."""
+        for emitter in list(self.observer.emitters):
+            self.observer.unschedule(emitter.watch)
+        self.observer.schedule(self.file_handler, self.watch_path, recursive=True)
+
+    def _unwatch_subtree(self, path):
+        for emitter in list(self.observer.emitters):
+            if emitter.watch.path == path and emitter.watch.is_recursive:
+                self.observer.unschedule(emitter.watch)
+
+    def on_created(self, event):
+        if event.is_directory:
+            self._watch_subtree(event.src_path)
+
+    def on_deleted(self, event):
+        if event.is_directory:
+            self._unwatch_subtree(event.src_path)
+
+    def on_moved(self, event):
+        if event.is_directory:
+            self._unwatch_subtree(event.src_path)
+            self._watch_subtree(event.dest_path)
+
+def positive_float(value):
+    """argparse type for intervals; zero or less would make the polling observer spin."""
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+def create_observer(observer_type="auto", poll_interval=DEFAULT_POLL_INTERVAL):
+    """Create the watchdog observer, applying poll_interval whenever it polls."""
+    if observer_type == "polling":
+        return PollingObserver(timeout=poll_interval)
+    if observer_type == "auto" and issubclass(Observer, PollingObserver):
+        # No native API on this platform, so watchdog would poll every second
+        return PollingObserver(timeout=poll_interval)
+    return Observer()
+
+def main(watch_path, sound_key, delay=None, exclude_file=None, exclude_dir=None, backend="watchdog",
+         observer_type="auto", poll_interval=DEFAULT_POLL_INTERVAL):
     if not os.path.exists(watch_path):
         print(f"Error: Directory {watch_path} does not exist.")
         sys.exit(1)
+    if not os.path.isdir(watch_path):
+        print(f"Error: {watch_path} is not a directory.")
+        sys.exit(1)
+
+    # Absolute paths keep event paths comparable with the handler's watch root
+    watch_path = os.path.abspath(watch_path)
+
+    if backend == "watchfiles" and watchfiles is None:
+        print("Error: The watchfiles backend requires the watchfiles package (pip install watchfiles).")
+        sys.exit(1)
 
     # Use configured delay if not specified in args
     actual_delay = delay if delay is not None else DEFAULT_DELAY
@@ -178,27 +446,61 @@ def main(watch_path, sound_key, delay=None, exclude_file=None, exclude_dir=None)
         sound_key, 
         excluded_files=excluded_files, 
         excluded_folders=excluded_folders,
-        delay=actual_delay
+        delay=actual_delay,
+        watch_path=watch_path
     )
     
-    observer = Observer()
-    observer.schedule(event_handler, watch_path, recursive=True)
-    observer.start()
+    # Fail fast on a misconfigured sound instead of silently at the first alert
+    if sound_key not in SOUND_FILES:
+        print(f"Error: No sound file found for '{sound_key}'; check sound_files in {CONFIG_FILE}")
+        sys.exit(1)
+
+    # Read the notification sound up front; it is decoded from memory at the first alert
+    try:
+        read_sound_bytes(sound_key)
+    except Exception as e:
+        print(f"Error loading sound: {e}")
+
+    if backend == "watchfiles":
+        stop_event = threading.Event()
+        watcher = threading.Thread(
+            target=_run_watchfiles,
+            args=(watch_path, event_handler, stop_event),
+            daemon=True
+        )
+        watcher.start()
+    else:
+        observer = create_observer(observer_type, poll_interval)
+        WatchScheduler(observer, event_handler, watch_path).schedule()
+        observer.start()
 
     print(f"Monitoring {watch_path} for changes...")
     print(f"Notification sound: {sound_key}")
     print(f"Activity timeout: {actual_delay} seconds")
     print(f"Notification volume: {DEFAULT_VOLUME * 100:.0f}%")
+    print(f"Watcher backend: {backend}")
+    if backend == "watchdog" and isinstance(observer, PollingObserver):
+        print(f"Polling interval: {poll_interval} seconds")
     print("Press Ctrl+C to stop monitoring.")
     
     try:
         while True:
-            time.sleep(1)
-            event_handler.check_completion()
+            changed = event_handler.wait_for_change()
+            if event_handler.watcher_error is not None:
+                print(f"Error: File watcher stopped: {event_handler.watcher_error}")
+                sys.exit(1)
+            if not changed:
+                event_handler.check_completion()
     except KeyboardInterrupt:
-        observer.stop()
+        if backend == "watchfiles":
+            stop_event.set()
+        else:
+            observer.stop()
         print("\nStopped monitoring.")
-    observer.join()
+    if backend == "watchfiles":
+        watcher.join()
+    else:
+        observer.join()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
@@ -233,13 +535,46 @@ if __name__ == "__main__":
         type=str, 
         help="Path to file containing list of directories to exclude (one per line)"
     )
+    parser.add_argument(
+        "--backend", 
+        type=str, 
+        default="watchdog", 
+        choices=["watchdog", "watchfiles"],
+        help="File watching backend; watchfiles is faster on busy trees but must be installed separately (default: watchdog)"
+    )
+    parser.add_argument(
+        "--observer", 
+        type=str, 
+        default=None, 
+        choices=["auto", "native", "polling"],
+        help="Watchdog observer; use polling for network drives where native events don't work (default: auto)"
+    )
+    parser.add_argument(
+        "--poll-interval", 
+        type=positive_float, 
+        default=None,
+        help=f"Seconds between scans when polling (default: {DEFAULT_POLL_INTERVAL})"
+    )
+    parser.add_argument(
+        "--verbose", 
+        action="store_true", 
+        help="Log detected changes (changes within 50 ms of the previous one are coalesced)"
+    )
     
     args = parser.parse_args()
+    if args.backend == "watchfiles" and (args.observer is not None or args.poll_interval is not None):
+        parser.error("--observer and --poll-interval only apply to the watchdog backend")
+    # Third-party loggers (watchdog, watchfiles) only surface warnings; --verbose affects our logger alone
+    logging.basicConfig(level=logging.WARNING, format="%(message)s")
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
     print(f"Starting Vibe Coding Monitor")
     main(
         args.watch_path, 
         args.sound, 
         delay=args.delay,
         exclude_file=args.exclude_file,
-        exclude_dir=args.exclude_dir
+        exclude_dir=args.exclude_dir,
+        backend=args.backend,
+        observer_type=args.observer or "auto",
+        poll_interval=args.poll_interval if args.poll_interval is not None else DEFAULT_POLL_INTERVAL
     )
\ No newline at end of file